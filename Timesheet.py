@@ -1,6 +1,10 @@
 import sys
 import os
-import json
+import orjson
+import itertools
+import uuid
+from functools import partial
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
@@ -9,47 +13,115 @@ from typing import List, Optional, Tuple, Dict, Any
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QPushButton, QTableWidget, QTextEdit, QLineEdit, QMessageBox, QHeaderView
+    QPushButton, QTableWidget, QTableWidgetItem, QPlainTextEdit, QLineEdit, QMessageBox, QHeaderView
 )
 import requests
 
 # ------------------ Data Models ------------------
 
-@dataclass
+# Session timestamps are local wall-clock time: naive datetime.now() values counted as if
+# they were UTC, the same basis as the ISO strings older files hold. They are not true
+# Unix epoch times, so readers outside this app must not treat them as UTC.
+NS_PER_MS = 1_000_000
+NUMBA_MIN_SESSIONS = 64  # below this the JIT call overhead outweighs the numpy temporaries
+
+
+def _sum_durations_loop(sessions):
+    total = 0
+    for i in range(sessions.shape[0]):
+        total += sessions[i, 1] - sessions[i, 0]
+    return total
+
+
+_sum_durations_jit = None  # compiled kernel once loaded; False if numba is unavailable
+
+
+def sum_durations_ns(sessions: np.ndarray) -> int:
+    """Sum of end - start over an (n, 2) session array, in nanoseconds."""
+    global _sum_durations_jit
+    if len(sessions) > NUMBA_MIN_SESSIONS:
+        if _sum_durations_jit is None:
+            # Imported on the first long day only, so ordinary startups never pay for numba
+            try:
+                from numba import njit
+                _sum_durations_jit = njit(cache=True)(_sum_durations_loop)
+            except ImportError:  # optional; numpy does the summing without it
+                _sum_durations_jit = False
+        if _sum_durations_jit:
+            return int(_sum_durations_jit(sessions))
+    return int((sessions[:, 1] - sessions[:, 0]).sum())
+
+
+def to_ns(value) -> int:
+    """Local wall-clock nanoseconds for a naive datetime, an ISO string (older files) or stored milliseconds."""
+    if isinstance(value, (datetime, str)):
+        return pd.Timestamp(value).value
+    return int(value) * NS_PER_MS
+
+
+@dataclass(eq=False)
 class DayData:
-    sessions: List[Tuple[str, str]] = field(default_factory=list)
+    # (n, 2) int64 array of local wall-clock [start_ns, end_ns]; stored on disk as millisecond pairs
+    sessions: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int64))
     notes: str = ""
     running_start: Optional[datetime] = field(default=None, repr=False)
+    _cached_seconds: float = field(default=0.0, repr=False)  # sum of completed sessions
+
+    def total_hours(self, now: Optional[datetime] = None) -> float:
+        """Completed plus running hours; pass now to share one clock read across many calls."""
+        live = ((now or datetime.now()) - self.running_start).total_seconds() if self.running_start else 0.0
+        return (self._cached_seconds + live) / 3600.0
 
-    def total_hours(self) -> float:
-        total = 0.0
-        for s_iso, e_iso in self.sessions:
-            s = datetime.fromisoformat(s_iso)
-            e = datetime.fromisoformat(e_iso)
-            total += (e - s).total_seconds() / 3600.0
-        if self.running_start:
-            total += (datetime.now() - self.running_start).total_seconds() / 3600.0
-        return total
+    def add_session(self, start_ns: int, end_ns: int):
+        self.sessions = np.vstack([self.sessions, np.array([[start_ns, end_ns]], dtype=np.int64)])
+        self._cached_seconds += (end_ns - start_ns) / 1e9
 
     def to_dict(self):
-        return {"sessions": self.sessions, "notes": self.notes}
+        return {"sessions": (self.sessions // NS_PER_MS).tolist(), "notes": self.notes}
 
     @staticmethod
-    def from_dict(d):
+    def from_dict(d, sessions: Optional[np.ndarray] = None):
         obj = DayData()
-        obj.sessions = d.get("sessions", [])
+        obj.sessions = DayData.batch_sessions([d])[0] if sessions is None else sessions
         obj.notes = d.get("notes", "")
+        obj._cached_seconds = sum_durations_ns(obj.sessions) / 1e9
         return obj
 
+    @staticmethod
+    def batch_sessions(raw_days: List[dict]) -> List[np.ndarray]:
+        """Session arrays for each raw day dict, converted in one vectorized pass.
+
+        Accepts the current local wall-clock millisecond pairs as well as older ISO-string pairs.
+        """
+        if not raw_days:
+            return []
+        flat, counts = [], []
+        for d in raw_days:
+            pairs = d.get("sessions", [])
+            counts.append(len(pairs))
+            for s, e in pairs:
+                flat.append(s)
+                flat.append(e)
+
+        ns = np.empty(len(flat), dtype=np.int64)
+        is_iso = np.fromiter((isinstance(v, str) for v in flat), dtype=bool, count=len(flat))
+        if is_iso.any():
+            iso = [v for v in flat if isinstance(v, str)]
+            ns[is_iso] = pd.to_datetime(iso, format="ISO8601").as_unit("ns").asi8
+        if not is_iso.all():
+            ns[~is_iso] = np.array([v for v in flat if not isinstance(v, str)], dtype=np.int64) * NS_PER_MS
+        return np.split(ns.reshape(-1, 2), np.cumsum(counts, dtype=np.int64)[:-1])
+
 
 @dataclass
 class TaskRowData:
     task: str
     subtask: str
     days: List[DayData] = field(default_factory=lambda: [DayData() for _ in range(7)])
+    row_id: int = field(default_factory=itertools.count().__next__, repr=False)  # stable, not persisted
 
-    def total_hours(self) -> float:
-        return sum(day.total_hours() for day in self.days)
+    def total_hours(self, now: Optional[datetime] = None) -> float:
+        return sum(day.total_hours(now) for day in self.days)
 
     def to_dict(self):
         return {
@@ -59,14 +131,63 @@ class TaskRowData:
         }
 
     @staticmethod
-    def from_dict(d):
+    def from_dict(d, day_sessions: Optional[List[np.ndarray]] = None):
         tr = TaskRowData(task=d["task"], subtask=d["subtask"])
-        tr.days = [DayData.from_dict(dd) for dd in d.get("days", [])]
+        raw_days = d.get("days", [])
+        if day_sessions is None:
+            day_sessions = DayData.batch_sessions(raw_days)
+        tr.days = [DayData.from_dict(dd, sessions) for dd, sessions in zip(raw_days, day_sessions)]
         return tr
 
 
+class WeekStore:
+    """Columnar (rows x 7) completed-session seconds for the week on screen.
+
+    Mirrors DayData._cached_seconds for self.rows so every total is an array
+    reduction rather than a Python loop over total_hours().
+    """
+
+    def __init__(self, rows: List[TaskRowData] = ()):
+        self.day_seconds = np.array(
+            [[d._cached_seconds for d in r.days] for r in rows], dtype=np.float64
+        ).reshape(-1, 7)
+
+    def append_row(self, row: TaskRowData):
+        self.day_seconds = np.vstack([self.day_seconds, [[d._cached_seconds for d in row.days]]])
+
+    def delete_row(self, ri: int):
+        self.day_seconds = np.delete(self.day_seconds, ri, axis=0)
+
+    def set_cell(self, ri: int, di: int, seconds: float):
+        self.day_seconds[ri, di] = seconds
+
+    def baselines(self, ri: int, di: int) -> Tuple[float, float, float, float]:
+        """Cell, row, day and week seconds around (ri, di)."""
+        m = self.day_seconds
+        return float(m[ri, di]), float(m[ri].sum()), float(m[:, di].sum()), float(m.sum())
+
+    def totals(self, active: Optional[Tuple[int, int]] = None, live_seconds: float = 0.0) -> Tuple[List[float], float]:
+        """Per-day and weekly hours, adding live_seconds to the active cell's day."""
+        day_totals = self.day_seconds.sum(axis=0)
+        if active:
+            day_totals[active[1]] += live_seconds
+        day_totals /= 3600.0
+        return day_totals.tolist(), float(day_totals.sum())
+
+
 # ------------------ UI Components ------------------
 
+# Applied once on the QApplication; per-cell widgets pick their rules up by object name
+APP_STYLESHEET = """
+QWidget { font-family: Segoe UI; font-size: 13px; }
+QPushButton#StartBtn { background-color: #4CAF50; color: white; border-radius: 6px; padding: 4px; }
+QPushButton#StartBtn[running="true"] { background-color: #E53935; }
+QPushButton#StartBtn:disabled { background-color: #9E9E9E; }
+QLabel#TaskName { font-weight: bold; color: #2C3E50; }
+QLabel#SubtaskName { color: #7f8c8d; font-size: 12px; }
+QPushButton#DeleteBtn { background-color: #B71C1C; color: white; border-radius: 6px; padding: 4px; }
+"""
+
 class DayCell(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -78,25 +199,51 @@ class DayCell(QWidget):
         self.hours.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.hours.setReadOnly(True)
         layout.addWidget(self.hours)
+        self._last_cents = -1  # hours last shown, in hundredths
 
         self.toggle_btn = QPushButton("Start")
-        self.toggle_btn.setStyleSheet("background-color: #4CAF50; color: white; border-radius: 6px; padding: 4px;")
+        self.toggle_btn.setObjectName("StartBtn")
+        self.toggle_btn.setProperty("running", False)
         layout.addWidget(self.toggle_btn)
 
-        self.notes = QTextEdit()
+        self.notes = QPlainTextEdit()  # plain text only; skips the rich-text document pipeline
         self.notes.setPlaceholderText("Notes…")
         layout.addWidget(self.notes)
 
     def set_hours(self, hrs: float):
+        # 0.01 h is 36 s, so most 1 Hz ticks leave the displayed value unchanged
+        cents = round(hrs * 100)
+        if cents == self._last_cents:
+            return
+        self._last_cents = cents
         self.hours.setText(f"{hrs:.2f}")
 
     def set_running(self, running: bool):
-        if running:
-            self.toggle_btn.setText("Stop")
-            self.toggle_btn.setStyleSheet("background-color: #E53935; color: white; border-radius: 6px; padding: 4px;")
-        else:
-            self.toggle_btn.setText("Start")
-            self.toggle_btn.setStyleSheet("background-color: #4CAF50; color: white; border-radius: 6px; padding: 4px;")
+        self.toggle_btn.setText("Stop" if running else "Start")
+        # Re-polish so the [running="true"] rule in APP_STYLESHEET is re-evaluated
+        self.toggle_btn.setProperty("running", running)
+        self.toggle_btn.style().unpolish(self.toggle_btn)
+        self.toggle_btn.style().polish(self.toggle_btn)
+
+
+class TotalItem(QTableWidgetItem):
+    """Read-only model item for a computed total; repaints via dataChanged, no widget."""
+
+    def __init__(self, hrs: float):
+        super().__init__()
+        self.setFlags(Qt.ItemFlag.ItemIsEnabled)
+        self.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._last_cents = -1
+        self.set_hours(hrs)
+
+    def set_hours(self, hrs: float) -> bool:
+        """Updates the text if the 2-decimal value changed; returns whether it did."""
+        cents = round(hrs * 100)
+        if cents == self._last_cents:
+            return False
+        self._last_cents = cents
+        self.setText(f"{hrs:.2f}")
+        return True
 
 
 class TaskCell(QWidget):
@@ -108,15 +255,15 @@ class TaskCell(QWidget):
 
         left = QVBoxLayout()
         lbl_t = QLabel(task if task else "(No Task)")
-        lbl_t.setStyleSheet("font-weight: bold; color: #2C3E50;")
+        lbl_t.setObjectName("TaskName")
         lbl_st = QLabel(subtask if subtask else "(No Subtask)")
-        lbl_st.setStyleSheet("color: #7f8c8d; font-size: 12px;")
+        lbl_st.setObjectName("SubtaskName")
         left.addWidget(lbl_t)
         left.addWidget(lbl_st)
         layout.addLayout(left)
 
         self.del_btn = QPushButton("🗑 Delete")
-        self.del_btn.setStyleSheet("background-color:#B71C1C; color:white; border-radius:6px; padding:4px;")
+        self.del_btn.setObjectName("DeleteBtn")
         self.del_btn.clicked.connect(delete_callback)
         layout.addWidget(self.del_btn)
 
@@ -125,6 +272,9 @@ class TaskCell(QWidget):
 
 class TimesheetApp(QWidget):
     DATA_FILE = "timesheet_data.json"
+    LOG_FILE = "timesheet_log.ndjson"  # sessions appended since the last DATA_FILE snapshot
+    LOG_COMPACT_LINES = 10000
+    GENERATION_KEY = "__generation__"  # snapshot id; log entries only replay onto the snapshot they follow
 
     def __init__(self):
         super().__init__()
@@ -137,10 +287,31 @@ class TimesheetApp(QWidget):
         self.timer.setInterval(1000)
         self.timer.timeout.connect(self._update_running_timer)
 
+        # Coalesces bursts of edits into a single write; flushed on close
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(2000)
+        self._save_timer.timeout.connect(self._save_data)
+        self._log_lines = 0
+        self._generation: Optional[str] = None
+
         self.data_store: Dict[str, Dict[str, Any]] = {} # MODIFIED: New structure
+        self._raw_store: Dict[str, Any] = {}  # weeks from DATA_FILE not yet parsed into data_store
         self.rows: List[TaskRowData] = []
+        self._rows_key: Optional[str] = None  # data key of the week self.rows belongs to
         self.is_submitted: bool = False
         self.cells: List[List[DayCell]] = []
+        self.week_store = WeekStore()
+        self.row_total_fields: List[TotalItem] = []
+        self.day_total_fields: List[TotalItem] = []
+        self.week_total_field: Optional[TotalItem] = None
+
+        # Running-timer baselines (seconds), captured when a timer starts
+        self._tick_anchor: Optional[datetime] = None
+        self._active_cell_total = 0.0
+        self._active_row_total = 0.0
+        self._active_day_total = 0.0
+        self._active_week_total = 0.0
 
         # Employee data
         self.employee_data = {
@@ -498,6 +669,9 @@ class TimesheetApp(QWidget):
             }
         }
 
+        # Static orderings for the combo boxes, computed once
+        self._sorted_employees = sorted(self.employee_data.keys())
+        self._sorted_tasks_by_dept = {dept: sorted(tasks.keys()) for dept, tasks in self.department_tasks.items()}
 
         self._load_data()
         self._build_ui()
@@ -510,7 +684,7 @@ class TimesheetApp(QWidget):
         # Top Section
         top = QHBoxLayout()
         self.emp_combo = QComboBox()
-        self.emp_combo.addItems(sorted(list(self.employee_data.keys())))
+        self.emp_combo.addItems(self._sorted_employees)
         self.emp_combo.currentTextChanged.connect(self._on_employee_changed) 
         top.addWidget(QLabel("Employee:"))
         top.addWidget(self.emp_combo, 1) # MODIFIED: Add stretch
@@ -577,56 +751,167 @@ class TimesheetApp(QWidget):
         
     def _on_task_changed(self, selected_task: str):
         """Updates the subtask combobox based on the selected task."""
-        self.subtask_combo.clear()
-        
         dept = self.dept_field.text()
         department_specific_tasks = self.department_tasks.get(dept, {})
         
         subtasks = department_specific_tasks.get(selected_task, [])
-        self.subtask_combo.addItems(subtasks)
+        self._set_combo_items(self.subtask_combo, subtasks)
+
+    @staticmethod
+    def _set_combo_items(combo: QComboBox, items: List[str]) -> bool:
+        """Replaces the combo's items without emitting signals; no-op if they already match."""
+        if [combo.itemText(i) for i in range(combo.count())] == list(items):
+            return False
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(items)
+        combo.blockSignals(False)
+        return True
 
     # ---------- Data ----------
     def _data_key(self):
         return f"{self.emp_combo.currentText()}::{self.week_start.isoformat()}"
 
     def _load_data(self):
-        if not os.path.exists(self.DATA_FILE):
+        if os.path.exists(self.DATA_FILE):
+            try:
+                # Weeks stay raw until first viewed; see _week()
+                with open(self.DATA_FILE, "rb") as f:
+                    raw = orjson.loads(f.read())
+                if not isinstance(raw, dict):
+                    raise ValueError("top level is not an object")
+                self._generation = raw.pop(self.GENERATION_KEY, None)
+                self._raw_store = raw
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                self._raw_store = {}
+                self._generation = None
+
+        # Entries from another snapshot (or none at all) are dropped by the generation check
+        self._replay_log()
+
+    def _week(self, key: str) -> Dict[str, Any]:
+        """Returns the week stored under key, parsing it from the raw file data on first use.
+
+        A week that fails to parse stays in _raw_store, so it is written back unchanged,
+        and a locked, empty placeholder carrying the error is returned instead.
+        """
+        week = self.data_store.get(key)
+        if week is not None:
+            return week
+
+        data = self._raw_store.get(key, [])
+        try:
+            # --- MODIFIED: Handle new data structure ---
+            if isinstance(data, list):
+                # Old format: Convert it
+                submitted, rows = False, data
+            elif isinstance(data, dict):
+                # New format
+                submitted, rows = data.get("submitted", False), data.get("rows", [])
+            else:
+                submitted, rows = False, []
+
+            # Convert the week's session timestamps in a single batch
+            day_sessions = DayData.batch_sessions([dd for r in rows for dd in r.get("days", [])])
+            parsed, offset = [], 0
+            for r in rows:
+                n = len(r.get("days", []))
+                parsed.append(TaskRowData.from_dict(r, day_sessions[offset:offset + n]))
+                offset += n
+        except Exception as e:
+            print(f"Error loading week {key}: {e}")
+            return {"submitted": True, "rows": [], "error": str(e)}
+
+        self._raw_store.pop(key, None)
+        week = self.data_store[key] = {"submitted": submitted, "rows": parsed}
+        return week
+
+    def _replay_log(self):
+        """Applies sessions logged after the last snapshot on top of data_store."""
+        if not os.path.exists(self.LOG_FILE):
             return
 
+        stale = 0
+        with open(self.LOG_FILE, "rb") as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                    if not isinstance(entry, dict):
+                        raise TypeError("entry is not an object")
+                    if self._generation is None or entry.get("gen") != self._generation:
+                        # Written against an older snapshot, which already holds it or was replaced
+                        stale += 1
+                        continue
+                    rows = self._week(entry["key"])["rows"]
+                    ri, di = entry["row"], entry["di"]
+                    if not (isinstance(ri, int) and 0 <= ri < len(rows)):
+                        raise IndexError(f"row {ri!r} out of range")
+                    if not (isinstance(di, int) and 0 <= di < len(rows[ri].days)):
+                        raise IndexError(f"day {di!r} out of range")
+                    start_ns, end_ns = to_ns(entry["start"]), to_ns(entry["end"])
+                except (ValueError, TypeError, KeyError, IndexError) as e:
+                    # A torn last line after a crash, or an entry the snapshot no longer matches
+                    print(f"Skipping session log entry: {e}")
+                    continue
+                rows[ri].days[di].add_session(start_ns, end_ns)
+                self._log_lines += 1
+        if stale:
+            print(f"Skipped {stale} session log entries from an earlier snapshot")
+
+    def _log_session(self, ri, di, session: Tuple[int, int]):
+        """Persists one finished session by appending to LOG_FILE instead of rewriting DATA_FILE.
+
+        Log entries address rows by index, so they are only valid while the snapshot
+        on disk has the same rows as memory. Add/delete always schedule a snapshot,
+        and while one is pending it will carry this session anyway.
+        """
+        if (self._save_timer.isActive() or self._generation is None
+                or self._log_lines >= self.LOG_COMPACT_LINES):
+            self._save_data()
+            return
+
+        entry = {
+            "gen": self._generation, "key": self._rows_key, "row": ri, "di": di,
+            "start": session[0] // NS_PER_MS, "end": session[1] // NS_PER_MS
+        }
         try:
-            with open(self.DATA_FILE, "r") as f:
-                raw = json.load(f)
-            
-            # --- MODIFIED: Handle new data structure ---
-            for key, data in raw.items():
-                if isinstance(data, list):
-                    # Old format: Convert it
-                    self.data_store[key] = {
-                        "submitted": False,
-                        "rows": [TaskRowData.from_dict(r) for r in data]
-                    }
-                elif isinstance(data, dict):
-                    # New format
-                    self.data_store[key] = {
-                        "submitted": data.get("submitted", False),
-                        "rows": [TaskRowData.from_dict(r) for r in data.get("rows", [])]
-                    }
+            with open(self.LOG_FILE, "ab") as f:
+                f.write(orjson.dumps(entry) + b"\n")
+            self._log_lines += 1
+            self.status_label.setText(f"Session logged at {datetime.now().strftime('%H:%M:%S')}")
         except Exception as e:
-            print(f"Error loading data: {e}")
-            self.data_store = {}
+            self.status_label.setText(f"Error logging session: {e}")
 
     def _save_data(self):
+        self._save_timer.stop()
         # --- MODIFIED: Save new data structure ---
-        out = {}
-        for k, v in self.data_store.items():
-            out[k] = {
-                "submitted": v.get("submitted", False),
-                "rows": [r.to_dict() for r in v.get("rows", [])]
-            }
-        
         try:
-            with open(self.DATA_FILE, "w") as f:
-                json.dump(out, f, indent=2)
+            # Write beside the snapshot and swap it in, so a crash mid-write never truncates it
+            tmp_file = self.DATA_FILE + ".tmp"
+            generation = uuid.uuid4().hex
+            with open(tmp_file, "wb") as f:
+                # Stream one week at a time instead of copying the whole store into a dict.
+                # Weeks never opened this run are written back exactly as they were read.
+                weeks = itertools.chain(
+                    self._raw_store.items(),
+                    ((k, {
+                        "submitted": v.get("submitted", False),
+                        "rows": [r.to_dict() for r in v.get("rows", [])]
+                    }) for k, v in self.data_store.items()),
+                )
+                f.write(b"{\n" + orjson.dumps(self.GENERATION_KEY) + b": " + orjson.dumps(generation))
+                for k, v in weeks:
+                    f.write(b",\n")
+                    f.write(orjson.dumps(k) + b": ")
+                    f.write(orjson.dumps(v))
+                f.write(b"\n}\n")
+            os.replace(tmp_file, self.DATA_FILE)
+            # The snapshot now holds every logged session; anything left in the log is stale
+            self._generation = generation
+            self._log_lines = 0
+            if os.path.exists(self.LOG_FILE):
+                open(self.LOG_FILE, "wb").close()
             self.status_label.setText(f"Data saved successfully at {datetime.now().strftime('%H:%M:%S')}")
         except Exception as e:
             self.status_label.setText(f"Error saving data: {e}")
@@ -637,31 +922,34 @@ class TimesheetApp(QWidget):
         dept = self.employee_data.get(emp, "")
         self.dept_field.setText(dept)
         
-        # Update task combo based on department
-        self.task_combo.clear()
-        department_specific_tasks = self.department_tasks.get(dept, {})
-        if department_specific_tasks:
-            self.task_combo.addItems(sorted(department_specific_tasks.keys()))
+        # Update task combo based on department; signals are blocked, so refresh subtasks here
+        if self._set_combo_items(self.task_combo, self._sorted_tasks_by_dept.get(dept, [])):
+            self._on_task_changed(self.task_combo.currentText())
         
         self._load_employee_week()
 
     def _load_employee_week(self):
         emp = self.emp_combo.currentText()
         if not emp: return
-        
+
+        if self.active_timer:
+            # The timer belongs to the week being left; record its session before switching
+            ri, di = self.active_timer
+            self._stop_timer(ri, di, self.cells[ri][di])
+
         key = self._data_key()
         
         # --- MODIFIED: Load from new structure ---
-        week_data = self.data_store.get(key, {"submitted": False, "rows": []})
-        
-        if key not in self.data_store:
-             self.data_store[key] = week_data
+        week_data = self._week(key)
+        self._rows_key = key
 
         self.rows = week_data["rows"]
         self.is_submitted = week_data["submitted"]
         
         self._build_table()
         self._set_ui_locked(self.is_submitted) # --- ADDED: Lock UI if submitted ---
+        if "error" in week_data:
+            self.status_label.setText(f"Could not load this week ({week_data['error']}); it is left unchanged on disk.")
 
     # ---------- Add/Delete Task ----------
     def _add_task(self):
@@ -673,54 +961,127 @@ class TimesheetApp(QWidget):
             
         new_row = TaskRowData(task, subtask)
         self.rows.append(new_row)
+        self.week_store.append_row(new_row)
         
         # --- MODIFIED: Save to new structure ---
-        self.data_store[self._data_key()]["rows"] = self.rows
-        self._save_data()
-        self._build_table()
+        self.data_store[self._rows_key]["rows"] = self.rows
+        self._save_timer.start()
 
-    def _delete_task(self, index):
+        # Insert just the new row above the totals row instead of rebuilding
+        ri = len(self.rows) - 1
+        self.table.insertRow(ri)
+        self._append_row(new_row, ri)
+        self._refresh_totals_row()
+
+    def _row_index(self, rid: int) -> int:
+        return next(i for i, r in enumerate(self.rows) if r.row_id == rid)
+
+    def _delete_task_by_id(self, rid: int, *_):
         confirm = QMessageBox.question(
             self, "Confirm Delete", "Are you sure you want to delete this task?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
+            index = self._row_index(rid)
             del self.rows[index]
+            self.week_store.delete_row(index)
             # --- MODIFIED: Save to new structure ---
-            self.data_store[self._data_key()]["rows"] = self.rows
-            self._save_data()
-            self._build_table()
+            self.data_store[self._rows_key]["rows"] = self.rows
+            self._save_timer.start()
+
+            self.table.removeRow(index)
+            self.cells.pop(index)
+            self.row_total_fields.pop(index)
+
+            if self.active_timer:
+                ari, adi = self.active_timer
+                if ari == index:
+                    self.timer.stop()
+                    self.active_timer = None
+                    self._enable_all_buttons(True)
+                else:
+                    if ari > index:
+                        self.active_timer = (ari - 1, adi)
+                    self._capture_timer_baselines(*self.active_timer)
+
+            self._refresh_totals_row()
 
     # ---------- Table ----------
     def _build_table(self):
-        self.table.setRowCount(0)
-        self.cells.clear()
-
-        for ri, row in enumerate(self.rows):
-            self.table.insertRow(ri)
-            self.table.setRowHeight(ri, 160)
-            cell_widget = TaskCell(row.task, row.subtask, lambda _, r=ri: self._delete_task(r))
-            self.table.setCellWidget(ri, 0, cell_widget)
-
-            day_widgets = []
-            for di in range(7):
-                dc = DayCell()
-                dc.set_hours(row.days[di].total_hours())
-                dc.notes.setText(row.days[di].notes) # --- ADDED: Load notes ---
-                dc.toggle_btn.clicked.connect(lambda _, r=ri, d=di, w=dc: self._toggle_timer(r, d, w))
-                day_widgets.append(dc)
-                self.table.setCellWidget(ri, di + 1, dc)
-            self.cells.append(day_widgets)
-
-            total = QLineEdit(f"{row.total_hours():.2f}")
-            total.setReadOnly(True)
-            total.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(ri, 8, total)
-
-        self._add_total_row()
-        self._update_week_total()
-
-    def _add_total_row(self):
+        # Suspend repaints and signals so Qt lays the table out once, not per cell widget
+        self.table.setUpdatesEnabled(False)
+        self.table.setSortingEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self.table.setRowCount(0)
+            self.cells.clear()
+            self.row_total_fields.clear()
+            self.day_total_fields.clear()
+            self.week_total_field = None
+            self.week_store = WeekStore(self.rows)
+
+            now = datetime.now()
+            self.table.setRowCount(len(self.rows))
+            for ri, row in enumerate(self.rows):
+                self._append_row(row, ri, now)
+
+            self._add_total_row(now)
+            self._update_week_total(now)
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+
+    def _append_row(self, row: TaskRowData, ri: int, now: Optional[datetime] = None):
+        """Creates the widgets for one task row in an already-inserted table row."""
+        self.table.setRowHeight(ri, 160)
+        cell_widget = TaskCell(row.task, row.subtask, partial(self._delete_task_by_id, row.row_id))
+        self.table.setCellWidget(ri, 0, cell_widget)
+
+        day_widgets = []
+        for di in range(7):
+            dc = DayCell()
+            dc.set_hours(row.days[di].total_hours(now))
+            dc.notes.setPlainText(row.days[di].notes) # --- ADDED: Load notes ---
+            dc.toggle_btn.clicked.connect(partial(self._toggle_timer_by_id, row.row_id, di))
+            if self.active_timer:
+                dc.toggle_btn.setEnabled(False)
+            day_widgets.append(dc)
+            self.table.setCellWidget(ri, di + 1, dc)
+        self.cells.insert(ri, day_widgets)
+
+        total = TotalItem(row.total_hours(now))
+        self.table.setItem(ri, 8, total)
+        self.row_total_fields.insert(ri, total)
+
+    def _refresh_totals_row(self):
+        """Brings the Daily Total row in line with self.rows without recreating it."""
+        now = datetime.now()
+        if not self.rows:
+            if self.week_total_field is not None:
+                self.table.removeRow(self.table.rowCount() - 1)
+                self.day_total_fields.clear()
+                self.week_total_field = None
+        elif self.week_total_field is None:
+            self._add_total_row(now)
+        else:
+            day_totals, week_total = self._compute_totals(now)
+            for field, total_day in zip(self.day_total_fields, day_totals):
+                field.set_hours(total_day)
+            self.week_total_field.set_hours(week_total)
+        self._update_week_total(now)
+
+    def _compute_totals(self, now: Optional[datetime] = None) -> Tuple[List[float], float]:
+        """Per-day and weekly totals, including the running timer's elapsed time."""
+        active, live = None, 0.0
+        if self.active_timer:
+            ri, di = self.active_timer
+            # Only count it if the timer is running in the week on screen
+            if ri < len(self.rows) and self.rows[ri].days[di].running_start is not None:
+                active = self.active_timer
+                live = ((now or datetime.now()) - self.rows[ri].days[di].running_start).total_seconds()
+        return self.week_store.totals(active, live)
+
+    def _add_total_row(self, now: Optional[datetime] = None):
         if not self.rows:
             return
         total_row = self.table.rowCount()
@@ -731,20 +1092,21 @@ class TimesheetApp(QWidget):
         total_lbl.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
         self.table.setCellWidget(total_row, 0, total_lbl)
 
-        for di in range(7):
-            total_day = sum(r.days[di].total_hours() for r in self.rows)
-            field = QLineEdit(f"{total_day:.2f}")
-            field.setReadOnly(True)
-            field.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(total_row, di + 1, field)
-
-        week_total = sum(r.total_hours() for r in self.rows)
-        total_field = QLineEdit(f"{week_total:.2f}")
-        total_field.setReadOnly(True)
-        total_field.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.table.setCellWidget(total_row, 8, total_field)
+        day_totals, week_total = self._compute_totals(now)
+        for di, total_day in enumerate(day_totals):
+            field = TotalItem(total_day)
+            self.table.setItem(total_row, di + 1, field)
+            self.day_total_fields.append(field)
+
+        total_field = TotalItem(week_total)
+        self.table.setItem(total_row, 8, total_field)
+        self.week_total_field = total_field
 
     # ---------- Timer ----------
+    def _toggle_timer_by_id(self, rid: int, di: int, *_):
+        ri = self._row_index(rid)
+        self._toggle_timer(ri, di, self.cells[ri][di])
+
     def _toggle_timer(self, ri, di, widget):
         if self.is_submitted: # --- ADDED: Check lock state ---
             return
@@ -763,7 +1125,8 @@ class TimesheetApp(QWidget):
             QMessageBox.warning(self, "Invalid", "You can only start today's timer.")
             return
 
-        dd.running_start = datetime.now()
+        self._capture_timer_baselines(ri, di)
+        dd.running_start = self._tick_anchor = datetime.now()
         widget.set_running(True)
         self.active_timer = (ri, di)
         self._enable_all_buttons(False, except_widget=widget)
@@ -771,33 +1134,50 @@ class TimesheetApp(QWidget):
 
     def _stop_timer(self, ri, di, widget):
         dd = self.rows[ri].days[di]
+        session = None
         if dd.running_start:
-            dd.sessions.append((dd.running_start.isoformat(), datetime.now().isoformat()))
+            session = (to_ns(dd.running_start), to_ns(datetime.now()))
+            dd.add_session(*session)
             dd.running_start = None
+            self.week_store.set_cell(ri, di, dd._cached_seconds)
         widget.set_running(False)
         widget.set_hours(dd.total_hours())
+        self.row_total_fields[ri].set_hours(self.rows[ri].total_hours())
         self.active_timer = None
         self._enable_all_buttons(True)
         self.timer.stop()
-        self._manual_save_data() # --- MODIFIED: Call manual save ---
-        self._build_table()
+        self._sync_notes_to_model() # Notes only; the session goes to the log
+        if session:
+            self._log_session(ri, di, session)
+        self._refresh_totals_row()
+
+    def _capture_timer_baselines(self, ri, di):
+        """Snapshots completed-session totals so each tick only adds the elapsed delta."""
+        (self._active_cell_total, self._active_row_total,
+         self._active_day_total, self._active_week_total) = self.week_store.baselines(ri, di)
 
     def _update_running_timer(self):
         if not self.active_timer:
             return
         ri, di = self.active_timer
-        hrs = self.rows[ri].days[di].total_hours()
-        self.cells[ri][di].set_hours(hrs)
-        self._update_week_total()
+        now = datetime.now()  # the only clock read this tick
+        delta = (now - self._tick_anchor).total_seconds()
+        self.cells[ri][di].set_hours((self._active_cell_total + delta) / 3600.0)
+        self.row_total_fields[ri].set_hours((self._active_row_total + delta) / 3600.0)
+        self.day_total_fields[di].set_hours((self._active_day_total + delta) / 3600.0)
+        week = (self._active_week_total + delta) / 3600.0
+        if self.week_total_field.set_hours(week):
+            self.week_total_lbl.setText(f"WEEKLY TOTAL: {week:.2f} h")
 
     def _enable_all_buttons(self, enable: bool, except_widget=None):
+        # setEnabled only flips a pseudo-state, so the :disabled rule applies without a re-polish
         for row in self.cells:
             for cell in row:
                 if cell != except_widget:
                     cell.toggle_btn.setEnabled(enable)
 
-    def _update_week_total(self):
-        total = sum(r.total_hours() for r in self.rows)
+    def _update_week_total(self, now: Optional[datetime] = None):
+        _, total = self._compute_totals(now)
         self.week_total_lbl.setText(f"WEEKLY TOTAL: {total:.2f} h")
 
     def _monday_of(self, d: date) -> date:
@@ -805,20 +1185,31 @@ class TimesheetApp(QWidget):
 
     # --- ADDED: New Save, Submit, and Lock functions ---
 
-    def _manual_save_data(self):
-        """Saves all data, including notes, to the data model and file."""
-        if self.is_submitted:
-            return
-            
+    def _sync_notes_to_model(self) -> bool:
+        """Copies the notes widgets into the data model. Returns True if any note changed."""
+        if self.is_submitted or self._rows_key is None:
+            return False
+
+        changed = False
         for ri, row in enumerate(self.rows):
             for di in range(7):
-                row.days[di].notes = self.cells[ri][di].notes.toPlainText()
-        
-        key = self._data_key()
+                text = self.cells[ri][di].notes.toPlainText()
+                if row.days[di].notes != text:
+                    row.days[di].notes = text
+                    changed = True
+
+        key = self._rows_key
         if key not in self.data_store:
              self.data_store[key] = {"submitted": False, "rows": []}
-             
+
         self.data_store[key]["rows"] = self.rows
+        return changed
+
+    def _manual_save_data(self):
+        """Saves all data, including notes, to the data model and file."""
+        if self.is_submitted or self._rows_key is None:
+            return
+        self._sync_notes_to_model()
         self._save_data()
 
     def _submit_week(self):
@@ -844,9 +1235,11 @@ class TimesheetApp(QWidget):
         emp = self.emp_combo.currentText()
         dept = self.dept_field.text()
         
+        now = datetime.now()
         for row in self.rows:
             for di, day in enumerate(row.days):
-                if day.total_hours() > 0 or day.notes:
+                hours = day.total_hours(now)
+                if hours > 0 or day.notes:
                     day_date = self.week_start + timedelta(days=di)
                     export_data.append({
                         "Employee": emp,
@@ -855,7 +1248,7 @@ class TimesheetApp(QWidget):
                         "Date": day_date.isoformat(),
                         "Task": row.task,
                         "Subtask": row.subtask,
-                        "Hours": round(day.total_hours(), 2),
+                        "Hours": round(hours, 2),
                         "Notes": day.notes
                     })
         
@@ -880,7 +1273,7 @@ class TimesheetApp(QWidget):
 
         # 4. Lock the data
         self.is_submitted = True
-        self.data_store[self._data_key()]["submitted"] = True
+        self.data_store[self._rows_key]["submitted"] = True
         self._save_data()
         self._set_ui_locked(True)
 
@@ -889,6 +1282,13 @@ class TimesheetApp(QWidget):
             f"Week submitted successfully!\nData exported to:\n{filename}"
         )
 
+    def closeEvent(self, event):
+        """Flushes unsaved notes, any pending debounced save or session log into a snapshot before closing."""
+        notes_changed = self._sync_notes_to_model()
+        if notes_changed or self._save_timer.isActive() or self._log_lines:
+            self._save_data()
+        super().closeEvent(event)
+
     def _set_ui_locked(self, locked: bool):
         """Enables or disables the UI based on submission status."""
         self.table.setEnabled(not locked)
@@ -922,7 +1322,7 @@ except Exception as e:
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    app.setStyleSheet("QWidget { font-family: Segoe UI; font-size: 13px; }")
+    app.setStyleSheet(APP_STYLESHEET)
     win = TimesheetApp()
     win.show()
     sys.exit(app.exec())